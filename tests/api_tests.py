@@ -37,6 +37,19 @@ class TestCollectionState(unittest.TestCase):
             func = lambda y0, t_points: torchdiffeq.odeint(tuple_f, (y0, y0), t_points, method='dopri5')[i]
             self.assertTrue(torch.autograd.gradcheck(func, (y0, t_points)))
 
+    def test_dopri5_mixed_shapes(self):
+        f, y0, t_points, sol = construct_problem(TEST_DEVICE)
+
+        tuple_f = lambda t, y: (f(t, y[0]), f(t, y[1]), f(t, y[2]))
+        tuple_y0 = (y0, y0.expand(2, 3).clone(), y0.reshape(1))
+
+        tuple_y = torchdiffeq.odeint(tuple_f, tuple_y0, t_points, method='dopri5')
+        self.assertEqual(tuple_y[0].shape, (len(t_points),))
+        self.assertEqual(tuple_y[1].shape, (len(t_points), 2, 3))
+        self.assertEqual(tuple_y[2].shape, (len(t_points), 1))
+        for y_, y0_ in zip(tuple_y, tuple_y0):
+            self.assertLess(max_abs(sol.reshape(-1, *(1,) * y0_.dim()) - y_), eps)
+
     def test_adams(self):
         f, y0, t_points, sol = construct_problem(TEST_DEVICE)
 
@@ -0,0 +1,68 @@
+"""Per-step overhead of the Runge-Kutta stage engine.
+
+Compares `_runge_kutta_step`, which keeps the tableau and the stages `k` as Tensors, against the
+list-of-Tensors formulation it replaced, where every stage is a Python sum over `_scaled_dot_product`.
+"""
+import argparse
+import time
+import torch
+from torchdiffeq._impl.misc import _scaled_dot_product
+from torchdiffeq._impl.rk_common import _convert_tableau, _runge_kutta_step
+from torchdiffeq._impl.dopri5 import _DORMAND_PRINCE_SHAMPINE_TABLEAU
+from torchdiffeq._impl.tsit5 import _TSITOURAS_TABLEAU
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--dim', type=int, default=64)
+parser.add_argument('--niters', type=int, default=2000)
+parser.add_argument('--gpu', type=int, default=0)
+args = parser.parse_args()
+
+device = torch.device('cuda:' + str(args.gpu) if torch.cuda.is_available() else 'cpu')
+
+
+def _list_runge_kutta_step(func, y0, f0, t0, dt, tableau):
+    k = [f0]
+    for alpha_i, beta_i in zip(tableau.alpha, tableau.beta):
+        ti = t0 + alpha_i * dt
+        yi = y0 + _scaled_dot_product(dt, beta_i, k)
+        k.append(func(ti, yi))
+    if not (tableau.c_sol[-1] == 0 and tableau.c_sol[:-1] == tableau.beta[-1]):
+        yi = y0 + _scaled_dot_product(dt, tableau.c_sol, k)
+    y1_error = _scaled_dot_product(dt, tableau.c_error, k)
+    return yi, k[-1], y1_error, k
+
+
+def _time(step, func, y0, tableau):
+    f0 = func(None, y0)
+    t0 = torch.tensor(0., dtype=y0.dtype, device=device)
+    dt = torch.tensor(0.01, dtype=y0.dtype, device=device)
+    for _ in range(10):
+        step(func, y0, f0, t0, dt, tableau)
+    if device.type == 'cuda':
+        torch.cuda.synchronize()
+    start_time = time.time()
+    for _ in range(args.niters):
+        step(func, y0, f0, t0, dt, tableau)
+    if device.type == 'cuda':
+        torch.cuda.synchronize()
+    return (time.time() - start_time) / args.niters
+
+
+def main():
+    A = torch.randn(args.dim, args.dim, dtype=torch.float64, device=device) / args.dim**0.5
+    func = lambda t, y: torch.tanh(A @ y)
+    y0 = torch.randn(args.dim, dtype=torch.float64, device=device)
+
+    for name, tableau in [('dopri5', _DORMAND_PRINCE_SHAMPINE_TABLEAU), ('tsit5', _TSITOURAS_TABLEAU)]:
+        tensor_tableau = _convert_tableau(tableau, dtype=y0.dtype, device=device)
+        list_time = _time(_list_runge_kutta_step, func, y0, tableau)
+        tensor_time = _time(_runge_kutta_step, func, y0, tensor_tableau)
+        print(
+            '{}: list {:.1f}us/step | tensor {:.1f}us/step | speedup {:.2f}x'.format(
+                name, list_time * 1e6, tensor_time * 1e6, list_time / tensor_time
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
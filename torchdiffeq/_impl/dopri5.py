@@ -1,12 +1,12 @@
 # Based on https://github.com/tensorflow/tensorflow/tree/master/tensorflow/contrib/integrate
 import torch
 from .misc import (
-    _scaled_dot_product, _convert_to_tensor, _is_finite, _select_initial_step, _handle_unused_kwargs, _is_iterable,
-    _optimal_step_size, _compute_error_ratio
+    _convert_to_tensor, _is_finite, _select_initial_step, _handle_unused_kwargs,
+    _optimal_step_size, _compute_error_ratio, _rms_norm
 )
 from .solvers import AdaptiveStepsizeODESolver
 from .interp import _interp_fit, _interp_evaluate
-from .rk_common import _RungeKuttaState, _ButcherTableau, _runge_kutta_step
+from .rk_common import _RungeKuttaState, _ButcherTableau, _convert_tableau, _runge_kutta_step
 
 _DORMAND_PRINCE_SHAMPINE_TABLEAU = _ButcherTableau(
     alpha=[1 / 5, 3 / 10, 4 / 5, 8 / 9, 1., 1.],
@@ -36,12 +36,12 @@ DPS_C_MID = [
 ]
 
 
-def _interp_fit_dopri5(y0, y1, k, dt, tableau=_DORMAND_PRINCE_SHAMPINE_TABLEAU):
+def _interp_fit_dopri5(y0, y1, k, dt, c_mid):
     """Fit an interpolating polynomial to the results of a Runge-Kutta step."""
-    dt = dt.type_as(y0[0])
-    y_mid = tuple(y0_ + _scaled_dot_product(dt, DPS_C_MID, k_) for y0_, k_ in zip(y0, k))
-    f0 = tuple(k_[0] for k_ in k)
-    f1 = tuple(k_[-1] for k_ in k)
+    dt = dt.type_as(y0)
+    y_mid = y0 + torch.tensordot(c_mid * dt, k, dims=1)
+    f0 = k[0]
+    f1 = k[-1]
     return _interp_fit(y0, y1, y_mid, f0, f1, dt)
 
 
@@ -59,25 +59,30 @@ class Dopri5Solver(AdaptiveStepsizeODESolver):
 
     def __init__(
         self, func, y0, rtol, atol, first_step=None, safety=0.9, ifactor=10.0, dfactor=0.2, max_num_steps=2**31 - 1,
-        **unused_kwargs
+        norm=_rms_norm, **unused_kwargs
     ):
         _handle_unused_kwargs(self, unused_kwargs)
         del unused_kwargs
 
         self.func = func
         self.y0 = y0
-        self.rtol = rtol if _is_iterable(rtol) else [rtol] * len(y0)
-        self.atol = atol if _is_iterable(atol) else [atol] * len(y0)
+        self.rtol = rtol
+        self.atol = atol
+        self.norm = norm
         self.first_step = first_step
-        self.safety = _convert_to_tensor(safety, dtype=torch.float64, device=y0[0].device)
-        self.ifactor = _convert_to_tensor(ifactor, dtype=torch.float64, device=y0[0].device)
-        self.dfactor = _convert_to_tensor(dfactor, dtype=torch.float64, device=y0[0].device)
-        self.max_num_steps = _convert_to_tensor(max_num_steps, dtype=torch.int32, device=y0[0].device)
+        self.safety = _convert_to_tensor(safety, dtype=torch.float64, device=y0.device)
+        self.ifactor = _convert_to_tensor(ifactor, dtype=torch.float64, device=y0.device)
+        self.dfactor = _convert_to_tensor(dfactor, dtype=torch.float64, device=y0.device)
+        self.max_num_steps = _convert_to_tensor(max_num_steps, dtype=torch.int32, device=y0.device)
+        self.tableau = _convert_tableau(_DORMAND_PRINCE_SHAMPINE_TABLEAU, dtype=y0.dtype, device=y0.device)
+        self.c_mid = _convert_to_tensor(DPS_C_MID, dtype=y0.dtype, device=y0.device)
 
     def before_integrate(self, t):
-        f0 = self.func(t[0].type_as(self.y0[0]), self.y0)
+        f0 = self.func(t[0].type_as(self.y0), self.y0)
         if self.first_step is None:
-            first_step = _select_initial_step(self.func, t[0], self.y0, 4, self.rtol[0], self.atol[0], f0=f0).to(t)
+            first_step = _select_initial_step(
+                self.func, t[0], self.y0, 4, self.rtol, self.atol, f0=f0, norm=self.norm
+            ).to(t)
         else:
             first_step = _convert_to_tensor(0.01, dtype=t.dtype, device=t.device)
         self.rk_state = _RungeKuttaState(self.y0, f0, t[0], t[0], first_step, interp_coeff=[self.y0] * 5)
@@ -98,15 +103,14 @@ class Dopri5Solver(AdaptiveStepsizeODESolver):
         #                      Assertions                      #
         ########################################################
         assert t0 + dt > t0, 'underflow in dt {}'.format(dt.item())
-        for y0_ in y0:
-            assert _is_finite(torch.abs(y0_)), 'non-finite values in state `y`: {}'.format(y0_)
-        y1, f1, y1_error, k = _runge_kutta_step(self.func, y0, f0, t0, dt, tableau=_DORMAND_PRINCE_SHAMPINE_TABLEAU)
+        assert _is_finite(torch.abs(y0)), 'non-finite values in state `y`: {}'.format(y0)
+        y1, f1, y1_error, k = _runge_kutta_step(self.func, y0, f0, t0, dt, tableau=self.tableau)
 
         ########################################################
         #                     Error Ratio                      #
         ########################################################
-        mean_sq_error_ratio = _compute_error_ratio(y1_error, atol=self.atol, rtol=self.rtol, y0=y0, y1=y1)
-        accept_step = (torch.tensor(mean_sq_error_ratio) <= 1).all()
+        error_ratio = _compute_error_ratio(y1_error, atol=self.atol, rtol=self.rtol, y0=y0, y1=y1, norm=self.norm)
+        accept_step = error_ratio <= 1
 
         ########################################################
         #                   Update RK State                    #
@@ -114,9 +118,9 @@ class Dopri5Solver(AdaptiveStepsizeODESolver):
         y_next = y1 if accept_step else y0
         f_next = f1 if accept_step else f0
         t_next = t0 + dt if accept_step else t0
-        interp_coeff = _interp_fit_dopri5(y0, y1, k, dt) if accept_step else interp_coeff
+        interp_coeff = _interp_fit_dopri5(y0, y1, k, dt, self.c_mid) if accept_step else interp_coeff
         dt_next = _optimal_step_size(
-            dt, mean_sq_error_ratio, safety=self.safety, ifactor=self.ifactor, dfactor=self.dfactor, order=5
+            dt, error_ratio, safety=self.safety, ifactor=self.ifactor, dfactor=self.dfactor, order=5
         )
         rk_state = _RungeKuttaState(y_next, f_next, t0, t_next, dt_next, interp_coeff)
         return rk_state
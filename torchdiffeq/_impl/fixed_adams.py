@@ -162,6 +162,7 @@ class AdamsBashforthMoulton(FixedGridODESolver):
         self.max_order = int(min(max_order, _MAX_ORDER))
         self.prev_f = collections.deque(maxlen=self.max_order - 1)
         self.prev_t = None
+        self.rk4_tableau = rk_common._convert_tableau(rk_common._RK4_TABLEAU, dtype=y0.dtype, device=y0.device)
 
     def _update_history(self, t, f):
         if self.prev_t is None or self.prev_t != t:
@@ -173,24 +174,24 @@ class AdamsBashforthMoulton(FixedGridODESolver):
         order = min(len(self.prev_f), self.max_order - 1)
         if order < _MIN_ORDER - 1:
             # Compute using RK4.
-            dy = rk_common.rk4_alt_step_func(func, t, dt, y, k1=self.prev_f[0])
+            dy = rk_common._fixed_runge_kutta_step(func, y, t, dt, self.rk4_tableau, f0=self.prev_f[0])
             return dy
         else:
             # Adams-Bashforth predictor.
             bashforth_coeffs = _BASHFORTH_COEFFICIENTS[order]
             ab_div = _DIVISOR[order]
-            dy = tuple(dt * _scaled_dot_product(1 / ab_div, bashforth_coeffs, f_) for f_ in zip(*self.prev_f))
+            dy = dt * _scaled_dot_product(1 / ab_div, bashforth_coeffs, self.prev_f)
 
             # Adams-Moulton corrector.
             if self.implicit:
                 moulton_coeffs = _MOULTON_COEFFICIENTS[order + 1]
                 am_div = _DIVISOR[order + 1]
-                delta = tuple(dt * _scaled_dot_product(1 / am_div, moulton_coeffs[1:], f_) for f_ in zip(*self.prev_f))
+                delta = dt * _scaled_dot_product(1 / am_div, moulton_coeffs[1:], self.prev_f)
                 converged = False
                 for _ in range(self.max_iters):
                     dy_old = dy
-                    f = func(t + dt, tuple(y_ + dy_ for y_, dy_ in zip(y, dy)))
-                    dy = tuple(dt * (moulton_coeffs[0] / am_div) * f_ + delta_ for f_, delta_ in zip(f, delta))
+                    f = func(t + dt, y + dy)
+                    dy = dt * (moulton_coeffs[0] / am_div) * f + delta
                     converged = _has_converged(dy_old, dy, self.rtol, self.atol)
                     if converged:
                         break
@@ -1,32 +1,41 @@
 from .solvers import FixedGridODESolver
-from . import rk_common
+from .rk_common import _EULER_TABLEAU, _MIDPOINT_TABLEAU, _RK4_TABLEAU, _convert_tableau, _fixed_runge_kutta_step
 
 
-class Euler(FixedGridODESolver):
+class _RungeKuttaFixedGridSolver(FixedGridODESolver):
+    """Fixed-grid solver for an explicit Runge-Kutta method given by `tableau`."""
+
+    tableau = None
+
+    def __init__(self, func, y0, **kwargs):
+        super(_RungeKuttaFixedGridSolver, self).__init__(func, y0, **kwargs)
+        self.tensor_tableau = _convert_tableau(self.tableau, dtype=y0.dtype, device=y0.device)
 
     def step_func(self, func, t, dt, y):
-        return tuple(dt * f_ for f_ in func(t, y))
+        return _fixed_runge_kutta_step(func, y, t, dt, self.tensor_tableau)
+
+
+class Euler(_RungeKuttaFixedGridSolver):
+
+    tableau = _EULER_TABLEAU
 
     @property
     def order(self):
         return 1
 
 
-class Midpoint(FixedGridODESolver):
+class Midpoint(_RungeKuttaFixedGridSolver):
 
-    def step_func(self, func, t, dt, y):
-        y_mid = tuple(y_ + f_ * dt / 2 for y_, f_ in zip(y, func(t, y)))
-        return tuple(dt * f_ for f_ in func(t + dt / 2, y_mid))
+    tableau = _MIDPOINT_TABLEAU
 
     @property
     def order(self):
         return 2
 
 
-class RK4(FixedGridODESolver):
+class RK4(_RungeKuttaFixedGridSolver):
 
-    def step_func(self, func, t, dt, y):
-        return rk_common.rk4_alt_step_func(func, t, dt, y)
+    tableau = _RK4_TABLEAU
 
     @property
     def order(self):
@@ -18,19 +18,10 @@ def _interp_fit(y0, y1, y_mid, f0, f1, dt):
         `p = a * x ** 4 + b * x ** 3 + c * x ** 2 + d * x + e` for values of `x`
         between 0 (start of interval) and 1 (end of interval).
     """
-    a = tuple(
-        _dot_product([-2 * dt, 2 * dt, -8, -8, 16], [f0_, f1_, y0_, y1_, y_mid_])
-        for f0_, f1_, y0_, y1_, y_mid_ in zip(f0, f1, y0, y1, y_mid)
-    )
-    b = tuple(
-        _dot_product([5 * dt, -3 * dt, 18, 14, -32], [f0_, f1_, y0_, y1_, y_mid_])
-        for f0_, f1_, y0_, y1_, y_mid_ in zip(f0, f1, y0, y1, y_mid)
-    )
-    c = tuple(
-        _dot_product([-4 * dt, dt, -11, -5, 16], [f0_, f1_, y0_, y1_, y_mid_])
-        for f0_, f1_, y0_, y1_, y_mid_ in zip(f0, f1, y0, y1, y_mid)
-    )
-    d = tuple(dt * f0_ for f0_ in f0)
+    a = _dot_product([-2 * dt, 2 * dt, -8, -8, 16], [f0, f1, y0, y1, y_mid])
+    b = _dot_product([5 * dt, -3 * dt, 18, 14, -32], [f0, f1, y0, y1, y_mid])
+    c = _dot_product([-4 * dt, dt, -11, -5, 16], [f0, f1, y0, y1, y_mid])
+    d = dt * f0
     e = y0
     return [a, b, c, d, e]
 
@@ -48,8 +39,8 @@ def _interp_evaluate(coefficients, t0, t1, t):
         Polynomial interpolation of the coefficients at time `t`.
     """
 
-    dtype = coefficients[0][0].dtype
-    device = coefficients[0][0].device
+    dtype = coefficients[0].dtype
+    device = coefficients[0].device
 
     t0 = _convert_to_tensor(t0, dtype=dtype, device=device)
     t1 = _convert_to_tensor(t1, dtype=dtype, device=device)
@@ -62,4 +53,4 @@ def _interp_evaluate(coefficients, t0, t1, t):
     for _ in range(2, len(coefficients)):
         xs.append(xs[-1] * x)
 
-    return tuple(_dot_product(coefficients_, reversed(xs)) for coefficients_ in zip(*coefficients))
+    return _dot_product(coefficients, reversed(xs))
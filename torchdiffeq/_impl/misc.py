@@ -3,7 +3,7 @@ import torch
 
 
 def _flatten(sequence):
-    flat = [p.contiguous().view(-1) for p in sequence]
+    flat = [p.reshape(-1) for p in sequence]
     return torch.cat(flat) if len(flat) > 0 else torch.tensor([])
 
 
@@ -30,11 +30,32 @@ def _dot_product(xs, ys):
     return sum([x * y for x, y in zip(xs, ys)])
 
 
+def _flat_to_shape(tensor, length, shapes):
+    """Unpack views of each component from a packed state.
+
+    Args:
+        tensor: Tensor whose last dimension holds the packed components.
+        length: tuple giving the leading dimensions of `tensor` to keep.
+        shapes: tuple of `torch.Size` giving the shape of each component.
+
+    Returns:
+        Tuple of Tensors of shape `(*length, *shape)`, sharing memory with `tensor`.
+    """
+    tensor_list = []
+    total = 0
+    for shape in shapes:
+        next_total = total + shape.numel()
+        # `view((...))` rather than `view(...)` so that `length=(), shape=()` works.
+        tensor_list.append(tensor[..., total:next_total].view((*length, *shape)))
+        total = next_total
+    return tuple(tensor_list)
+
+
 def _has_converged(y0, y1, rtol, atol):
     """Checks that each element is within the error tolerance."""
-    error_tol = tuple(atol + rtol * torch.max(torch.abs(y0_), torch.abs(y1_)) for y0_, y1_ in zip(y0, y1))
-    error = tuple(torch.abs(y0_ - y1_) for y0_, y1_ in zip(y0, y1))
-    return all((error_ < error_tol_).all() for error_, error_tol_ in zip(error, error_tol))
+    error_tol = atol + rtol * torch.max(torch.abs(y0), torch.abs(y1))
+    error = torch.abs(y0 - y1)
+    return (error < error_tol).all()
 
 
 def _convert_to_tensor(a, dtype=None, device=None):
@@ -68,12 +89,39 @@ def _is_iterable(inputs):
         return False
 
 
-def _norm(x):
+def _rms_norm(x):
     """Compute RMS norm."""
-    if torch.is_tensor(x):
-        return x.norm() / (x.numel()**0.5)
-    else:
-        return torch.sqrt(sum(x_.norm()**2 for x_ in x) / sum(x_.numel() for x_ in x))
+    return x.norm() / (x.numel()**0.5)
+
+
+class _MixedRMSNorm(object):
+    """RMS norm of each component of a packed state, maximised over the components.
+
+    This is the error norm used for tuple-valued states: every component is
+    controlled separately, as if it had been solved on its own. The per-component
+    sums are computed with a single `index_add` over the packed buffer.
+    """
+
+    def __init__(self, shapes):
+        self.numels = [shape.numel() for shape in shapes]
+        self._segments = {}
+
+    def _get_segments(self, x):
+        key = (x.device, x.dtype)
+        if key not in self._segments:
+            numels = torch.tensor(self.numels, device=x.device)
+            index = torch.repeat_interleave(torch.arange(len(self.numels), device=x.device), numels)
+            counts = numels.clamp(min=1).to(x.dtype)
+            self._segments[key] = (index, counts)
+        return self._segments[key]
+
+    def __call__(self, x):
+        index, counts = self._get_segments(x)
+        sq = torch.zeros(len(self.numels), dtype=x.dtype, device=x.device).index_add(0, index, x * x)
+        mean_sq = torch.max(sq / counts)
+        # Like `Tensor.norm`, use a zero subgradient at 0 rather than the NaN that `sqrt` would give.
+        nonzero = mean_sq > 0
+        return torch.where(nonzero, mean_sq, torch.ones_like(mean_sq)).sqrt() * nonzero
 
 
 def _handle_unused_kwargs(solver, unused_kwargs):
@@ -81,7 +129,7 @@ def _handle_unused_kwargs(solver, unused_kwargs):
         warnings.warn('{}: Unexpected arguments {}'.format(solver.__class__.__name__, unused_kwargs))
 
 
-def _select_initial_step(fun, t0, y0, order, rtol, atol, f0=None):
+def _select_initial_step(fun, t0, y0, order, rtol, atol, f0=None, norm=_rms_norm):
     """Empirically select a good initial step.
 
     The algorithm is described in [1]_.
@@ -102,6 +150,8 @@ def _select_initial_step(fun, t0, y0, order, rtol, atol, f0=None):
         Desired relative tolerance.
     atol : float
         Desired absolute tolerance.
+    norm : callable
+        Norm used to measure the state and its derivatives.
 
     Returns
     -------
@@ -113,83 +163,94 @@ def _select_initial_step(fun, t0, y0, order, rtol, atol, f0=None):
     .. [1] E. Hairer, S. P. Norsett G. Wanner, "Solving Ordinary Differential
            Equations I: Nonstiff Problems", Sec. II.4.
     """
-    t0 = t0.to(y0[0])
+    t0 = t0.to(y0)
     if f0 is None:
         f0 = fun(t0, y0)
 
-    rtol = rtol if _is_iterable(rtol) else [rtol] * len(y0)
-    atol = atol if _is_iterable(atol) else [atol] * len(y0)
+    scale = atol + torch.abs(y0) * rtol
 
-    scale = tuple(atol_ + torch.abs(y0_) * rtol_ for y0_, atol_, rtol_ in zip(y0, atol, rtol))
+    d0 = norm(y0 / scale)
+    d1 = norm(f0 / scale)
 
-    d0 = tuple(_norm(y0_ / scale_) for y0_, scale_ in zip(y0, scale))
-    d1 = tuple(_norm(f0_ / scale_) for f0_, scale_ in zip(f0, scale))
-
-    if max(d0).item() < 1e-5 or max(d1).item() < 1e-5:
+    if d0.item() < 1e-5 or d1.item() < 1e-5:
         h0 = torch.tensor(1e-6).to(t0)
     else:
-        h0 = 0.01 * max(d0_ / d1_ for d0_, d1_ in zip(d0, d1))
+        h0 = 0.01 * d0 / d1
 
-    y1 = tuple(y0_ + h0 * f0_ for y0_, f0_ in zip(y0, f0))
+    y1 = y0 + h0 * f0
     f1 = fun(t0 + h0, y1)
 
-    d2 = tuple(_norm((f1_ - f0_) / scale_) / h0 for f1_, f0_, scale_ in zip(f1, f0, scale))
+    d2 = norm((f1 - f0) / scale) / h0
 
-    if max(d1).item() <= 1e-15 and max(d2).item() <= 1e-15:
+    if d1.item() <= 1e-15 and d2.item() <= 1e-15:
         h1 = torch.max(torch.tensor(1e-6).to(h0), h0 * 1e-3)
     else:
-        h1 = (0.01 / max(d1 + d2))**(1. / float(order + 1))
+        h1 = (0.01 / torch.max(d1, d2))**(1. / float(order + 1))
 
     return torch.min(100 * h0, h1)
 
 
-def _compute_error_ratio(error_estimate, error_tol=None, rtol=None, atol=None, y0=None, y1=None):
+def _compute_error_ratio(error_estimate, error_tol=None, rtol=None, atol=None, y0=None, y1=None, norm=_rms_norm):
+    """Compute the norm of the error estimate relative to the error tolerance. A step is accepted if this is <= 1."""
     if error_tol is None:
         assert rtol is not None and atol is not None and y0 is not None and y1 is not None
-        rtol if _is_iterable(rtol) else [rtol] * len(y0)
-        atol if _is_iterable(atol) else [atol] * len(y0)
-        error_tol = tuple(
-            atol_ + rtol_ * torch.max(torch.abs(y0_), torch.abs(y1_))
-            for atol_, rtol_, y0_, y1_ in zip(atol, rtol, y0, y1)
-        )
-    error_ratio = tuple(error_estimate_ / error_tol_ for error_estimate_, error_tol_ in zip(error_estimate, error_tol))
-    mean_sq_error_ratio = tuple(torch.mean(error_ratio_ * error_ratio_) for error_ratio_ in error_ratio)
-    return mean_sq_error_ratio
-
-
-def _optimal_step_size(last_step, mean_error_ratio, safety=0.9, ifactor=10.0, dfactor=0.2, order=5):
+        error_tol = atol + rtol * torch.max(torch.abs(y0), torch.abs(y1))
+    return norm(error_estimate / error_tol)
+
+
+def _optimal_step_size(last_step, error_ratio, safety=0.9, ifactor=10.0, dfactor=0.2, order=5):
     """Calculate the optimal size for the next step."""
-    mean_error_ratio = max(mean_error_ratio)  # Compute step size based on highest ratio.
-    if mean_error_ratio == 0:
+    if error_ratio == 0:
         return last_step * ifactor
-    if mean_error_ratio < 1:
-        dfactor = _convert_to_tensor(1, dtype=torch.float64, device=mean_error_ratio.device)
-    error_ratio = torch.sqrt(mean_error_ratio).to(last_step)
+    if error_ratio < 1:
+        dfactor = _convert_to_tensor(1, dtype=torch.float64, device=error_ratio.device)
+    error_ratio = error_ratio.to(last_step)
     exponent = torch.tensor(1 / order).to(last_step)
     factor = torch.max(1 / ifactor, torch.min(error_ratio**exponent / safety, 1 / dfactor))
     return last_step / factor
 
 
-def _check_inputs(func, y0, t):
-    tensor_input = False
-    if torch.is_tensor(y0):
-        tensor_input = True
-        y0 = (y0,)
-        _base_nontuple_func_ = func
-        func = lambda t, y: (_base_nontuple_func_(t, y[0]),)
-    assert isinstance(y0, tuple), 'y0 must be either a torch.Tensor or a tuple'
-    for y0_ in y0:
-        assert torch.is_tensor(y0_), 'each element must be a torch.Tensor but received {}'.format(type(y0_))
+def _tuple_tol(name, tol, shapes):
+    """Expand a per-component tolerance into a tolerance for the packed state."""
+    if not _is_iterable(tol):
+        return tol
+    tol = tuple(tol)
+    assert len(tol) == len(shapes), 'If using tupled {} it must have the same length as the tuple y0'.format(name)
+    return torch.cat([_convert_to_tensor(tol_).expand(shape.numel()) for tol_, shape in zip(tol, shapes)])
+
+
+def _check_inputs(func, y0, t, rtol, atol, options):
+    """Normalise the inputs of `odeint`.
+
+    Tuple-valued states are packed into a single flat Tensor, so that the solvers
+    only ever see one Tensor; `func` is wrapped to receive views of the individual
+    components. The returned `shapes` (None for Tensor input) is needed to unpack
+    the solution again with `_flat_to_shape`.
+    """
+    shapes = None
+    if not torch.is_tensor(y0):
+        assert isinstance(y0, tuple), 'y0 must be either a torch.Tensor or a tuple'
+        for y0_ in y0:
+            assert torch.is_tensor(y0_), 'each element must be a torch.Tensor but received {}'.format(type(y0_))
+        shapes = tuple(y0_.shape for y0_ in y0)
+        y0 = _flatten(y0)
+        rtol = _tuple_tol('rtol', rtol, shapes)
+        atol = _tuple_tol('atol', atol, shapes)
+        rtol = rtol.to(y0) if torch.is_tensor(rtol) else rtol
+        atol = atol.to(y0) if torch.is_tensor(atol) else atol
+        _base_tuple_func = func
+        func = lambda t, y: _flatten(_base_tuple_func(t, _flat_to_shape(y, (), shapes)))
+        options = dict(options)
+        options.setdefault('norm', _MixedRMSNorm(shapes))
 
     if _decreasing(t):
         t = -t
         _base_reverse_func = func
-        func = lambda t, y: tuple(-f_ for f_ in _base_reverse_func(-t, y))
+        func = lambda t, y: -_base_reverse_func(-t, y)
 
-    for y0_ in y0:
-        if not torch.is_floating_point(y0_):
-            raise TypeError('`y0` must be a floating point Tensor but is a {}'.format(y0_.type()))
+    if not torch.is_floating_point(y0):
+        raise TypeError('`y0` must be a floating point Tensor but is a {}'.format(y0.type()))
     if not torch.is_floating_point(t):
         raise TypeError('`t` must be a floating point Tensor but is a {}'.format(t.type()))
 
-    return tensor_input, func, y0, t
+    return shapes, func, y0, t, rtol, atol, options
@@ -3,7 +3,7 @@ from .dopri5 import Dopri5Solver
 from .fixed_grid import Euler, Midpoint, RK4
 from .fixed_adams import AdamsBashforth, AdamsBashforthMoulton
 from .adams import VariableCoefficientAdamsBashforth
-from .misc import _check_inputs
+from .misc import _check_inputs, _flat_to_shape
 
 SOLVERS = {
     'explicit_adams': AdamsBashforth,
@@ -58,8 +58,6 @@ def odeint(func, y0, t, rtol=1e-7, atol=1e-9, method=None, options=None):
             an invalid dtype.
     """
 
-    tensor_input, func, y0, t = _check_inputs(func, y0, t)
-
     if options is None:
         options = {}
     elif method is None:
@@ -68,9 +66,11 @@ def odeint(func, y0, t, rtol=1e-7, atol=1e-9, method=None, options=None):
     if method is None:
         method = 'dopri5'
 
+    shapes, func, y0, t, rtol, atol, options = _check_inputs(func, y0, t, rtol, atol, options)
+
     solver = SOLVERS[method](func, y0, rtol=rtol, atol=atol, **options)
     solution = solver.integrate(t)
 
-    if tensor_input:
-        solution = solution[0]
+    if shapes is not None:
+        solution = _flat_to_shape(solution, (len(t),), shapes)
     return solution
@@ -1,9 +1,12 @@
 # Based on https://github.com/tensorflow/tensorflow/tree/master/tensorflow/contrib/integrate
 import collections
-from .misc import _scaled_dot_product, _convert_to_tensor
+import torch
+from .misc import _convert_to_tensor
 
 _ButcherTableau = collections.namedtuple('_ButcherTableau', 'alpha beta c_sol c_error')
 
+_TensorTableau = collections.namedtuple('_TensorTableau', 'alpha beta c_sol c_error fsal')
+
 
 class _RungeKuttaState(collections.namedtuple('_RungeKuttaState', 'y1, f1, t0, t1, dt, interp_coeff')):
     """Saved state of the Runge Kutta solver.
@@ -14,9 +17,58 @@ class _RungeKuttaState(collections.namedtuple('_RungeKuttaState', 'y1, f1, t0, t
         t0: scalar float64 Tensor giving start of the last time step.
         t1: scalar float64 Tensor giving end of the last time step.
         dt: scalar float64 Tensor giving the size for the next time step.
-        interp_coef: list of Tensors giving coefficients for polynomial
-            interpolation between `t0` and `t1`.
+        interp_coeff: coefficients for polynomial interpolation between `t0`
+            and `t1`, in a form specific to each solver.
+    """
+
+
+class _UncheckedAssign(torch.autograd.Function):
+    """Write `value` into `scratch[index]` in place, without tripping autograd's version check.
+
+    Each stage of a Runge-Kutta step is written exactly once and earlier stages are never
+    modified, so tensors saved for backward from `scratch` remain valid.
+    """
+
+    @staticmethod
+    def forward(ctx, scratch, value, index):
+        ctx.index = index
+        scratch.data[index] = value
+        return scratch
+
+    @staticmethod
+    def backward(ctx, grad_scratch):
+        return grad_scratch, grad_scratch[ctx.index], None
+
+
+def _convert_tableau(tableau, dtype, device):
+    """Convert the coefficients of a `_ButcherTableau` into Tensors, once per solve.
+
+    Returns:
+        A `_TensorTableau`, where `fsal` records whether the solution is the input to
+        the last stage (true for Dormand-Prince and Tsitouras), which lets us save a
+        few FLOPs.
     """
+    to_tensor = lambda x: torch.tensor(x, dtype=dtype, device=device)
+    fsal = len(tableau.beta) > 0 and tableau.c_sol[-1] == 0 and list(tableau.c_sol[:-1]) == list(tableau.beta[-1])
+    return _TensorTableau(
+        alpha=to_tensor(tableau.alpha),
+        beta=[to_tensor(beta_i) for beta_i in tableau.beta],
+        c_sol=to_tensor(tableau.c_sol),
+        c_error=None if tableau.c_error is None else to_tensor(tableau.c_error),
+        fsal=fsal,
+    )
+
+
+def _runge_kutta_stages(func, y0, f0, t0, dt, tableau):
+    """Evaluate the stages of a Runge-Kutta step into a `[stages, *y0.shape]` Tensor."""
+    k = torch.empty(len(tableau.c_sol), *f0.shape, dtype=y0.dtype, device=y0.device)
+    k = _UncheckedAssign.apply(k, f0, 0)
+    yi = y0
+    for i, (alpha_i, beta_i) in enumerate(zip(tableau.alpha, tableau.beta)):
+        ti = t0 + alpha_i * dt
+        yi = y0 + torch.tensordot(beta_i * dt, k[:i + 1], dims=1)
+        k = _UncheckedAssign.apply(k, func(ti, yi), i + 1)
+    return k, yi
 
 
 def _runge_kutta_step(func, y0, f0, t0, dt, tableau):
@@ -29,50 +81,55 @@ def _runge_kutta_step(func, y0, f0, t0, dt, tableau):
         f0: Tensor initial value for the derivative, computed from `func(t0, y0)`.
         t0: float64 scalar Tensor giving the initial time.
         dt: float64 scalar Tensor giving the size of the desired time step.
-        tableau: optional _ButcherTableau describing how to take the Runge-Kutta
-            step.
-        name: optional name for the operation.
+        tableau: _TensorTableau describing how to take the Runge-Kutta step, as
+            created by `_convert_tableau`.
 
     Returns:
         Tuple `(y1, f1, y1_error, k)` giving the estimated function value after
         the Runge-Kutta step at `t1 = t0 + dt`, the derivative of the state at `t1`,
-        estimated error at `t1`, and a list of Runge-Kutta coefficients `k` used for
-        calculating these terms.
+        estimated error at `t1`, and a `[stages, *y0.shape]` Tensor of Runge-Kutta
+        coefficients `k` used for calculating these terms.
     """
-    dtype = y0[0].dtype
-    device = y0[0].device
+    dtype = y0.dtype
+    device = y0.device
 
     t0 = _convert_to_tensor(t0, dtype=dtype, device=device)
     dt = _convert_to_tensor(dt, dtype=dtype, device=device)
 
-    k = tuple(map(lambda x: [x], f0))
-    for alpha_i, beta_i in zip(tableau.alpha, tableau.beta):
-        ti = t0 + alpha_i * dt
-        yi = tuple(y0_ + _scaled_dot_product(dt, beta_i, k_) for y0_, k_ in zip(y0, k))
-        tuple(k_.append(f_) for k_, f_ in zip(k, func(ti, yi)))
-
-    if not (tableau.c_sol[-1] == 0 and tableau.c_sol[:-1] == tableau.beta[-1]):
-        # This property (true for Dormand-Prince) lets us save a few FLOPs.
-        yi = tuple(y0_ + _scaled_dot_product(dt, tableau.c_sol, k_) for y0_, k_ in zip(y0, k))
+    k, yi = _runge_kutta_stages(func, y0, f0, t0, dt, tableau)
+    if not tableau.fsal:
+        yi = y0 + torch.tensordot(tableau.c_sol * dt, k, dims=1)
 
     y1 = yi
-    f1 = tuple(k_[-1] for k_ in k)
-    y1_error = tuple(_scaled_dot_product(dt, tableau.c_error, k_) for k_ in k)
+    f1 = k[-1]
+    y1_error = torch.tensordot(tableau.c_error * dt, k, dims=1)
     return (y1, f1, y1_error, k)
 
 
-def rk4_step_func(func, t, dt, y, k1=None):
-    if k1 is None: k1 = func(t, y)
-    k2 = func(t + dt / 2, tuple(y_ + dt * k1_ / 2 for y_, k1_ in zip(y, k1)))
-    k3 = func(t + dt / 2, tuple(y_ + dt * k2_ / 2 for y_, k2_ in zip(y, k2)))
-    k4 = func(t + dt, tuple(y_ + dt * k3_ for y_, k3_ in zip(y, k3)))
-    return tuple((k1_ + 2 * k2_ + 2 * k3_ + k4_) * (dt / 6) for k1_, k2_, k3_, k4_ in zip(k1, k2, k3, k4))
-
+def _fixed_runge_kutta_step(func, y0, t0, dt, tableau, f0=None):
+    """Take a Runge-Kutta step without error estimate.
 
-def rk4_alt_step_func(func, t, dt, y, k1=None):
-    """Smaller error with slightly more compute."""
-    if k1 is None: k1 = func(t, y)
-    k2 = func(t + dt / 3, tuple(y_ + dt * k1_ / 3 for y_, k1_ in zip(y, k1)))
-    k3 = func(t + dt * 2 / 3, tuple(y_ + dt * (k1_ / -3 + k2_) for y_, k1_, k2_ in zip(y, k1, k2)))
-    k4 = func(t + dt, tuple(y_ + dt * (k1_ - k2_ + k3_) for y_, k1_, k2_, k3_ in zip(y, k1, k2, k3)))
-    return tuple((k1_ + 3 * k2_ + 3 * k3_ + k4_) * (dt / 8) for k1_, k2_, k3_, k4_ in zip(k1, k2, k3, k4))
+    Returns:
+        Tensor giving the increment `y1 - y0` of the state over the step.
+    """
+    if f0 is None:
+        f0 = func(t0, y0)
+    k, _ = _runge_kutta_stages(func, y0, f0, t0, dt, tableau)
+    return torch.tensordot(tableau.c_sol * dt, k, dims=1)
+
+
+_EULER_TABLEAU = _ButcherTableau(alpha=[], beta=[], c_sol=[1.], c_error=None)
+
+_MIDPOINT_TABLEAU = _ButcherTableau(alpha=[1 / 2], beta=[[1 / 2]], c_sol=[0., 1.], c_error=None)
+
+# Fourth-order Runge-Kutta with 3/8 rule: smaller error with slightly more compute than the classic method.
+_RK4_TABLEAU = _ButcherTableau(
+    alpha=[1 / 3, 2 / 3, 1.],
+    beta=[
+        [1 / 3],
+        [-1 / 3, 1.],
+        [1., -1., 1.],
+    ],
+    c_sol=[1 / 8, 3 / 8, 3 / 8, 1 / 8],
+    c_error=None,
+)
@@ -25,12 +25,12 @@ class AdaptiveStepsizeODESolver(object):
     def integrate(self, t):
         _assert_increasing(t)
         solution = [self.y0]
-        t = t.to(self.y0[0].device, torch.float64)
+        t = t.to(self.y0.device, torch.float64)
         self.before_integrate(t)
         for i in range(1, len(t)):
             y = self.advance(t[i])
             solution.append(y)
-        return tuple(map(torch.stack, tuple(zip(*solution))))
+        return torch.stack(solution)
 
 
 class FixedGridODESolver(object):
@@ -39,6 +39,7 @@ class FixedGridODESolver(object):
     def __init__(self, func, y0, step_size=None, grid_constructor=None, **unused_kwargs):
         unused_kwargs.pop('rtol', None)
         unused_kwargs.pop('atol', None)
+        unused_kwargs.pop('norm', None)
         _handle_unused_kwargs(self, unused_kwargs)
         del unused_kwargs
 
@@ -78,10 +79,10 @@ class FixedGridODESolver(object):
 
     def integrate(self, t):
         _assert_increasing(t)
-        t = t.type_as(self.y0[0])
+        t = t.type_as(self.y0)
         time_grid = self.grid_constructor(self.func, self.y0, t)
         assert time_grid[0] == t[0] and time_grid[-1] == t[-1]
-        time_grid = time_grid.to(self.y0[0])
+        time_grid = time_grid.to(self.y0)
 
         solution = [self.y0]
 
@@ -89,20 +90,20 @@ class FixedGridODESolver(object):
         y0 = self.y0
         for t0, t1 in zip(time_grid[:-1], time_grid[1:]):
             dy = self.step_func(self.func, t0, t1 - t0, y0)
-            y1 = tuple(y0_ + dy_ for y0_, dy_ in zip(y0, dy))
+            y1 = y0 + dy
             y0 = y1
 
             while j < len(t) and t1 >= t[j]:
                 solution.append(self._linear_interp(t0, t1, y0, y1, t[j]))
                 j += 1
 
-        return tuple(map(torch.stack, tuple(zip(*solution))))
+        return torch.stack(solution)
 
     def _linear_interp(self, t0, t1, y0, y1, t):
         if t == t0:
             return y0
         if t == t1:
             return y1
-        t0, t1, t = t0.to(y0[0]), t1.to(y0[0]), t.to(y0[0])
-        slope = tuple((y1_ - y0_) / (t1 - t0) for y0_, y1_, in zip(y0, y1))
-        return tuple(y0_ + slope_ * (t - t0) for y0_, slope_ in zip(y0, slope))
+        t0, t1, t = t0.to(y0), t1.to(y0), t.to(y0)
+        slope = (y1 - y0) / (t1 - t0)
+        return y0 + slope * (t - t0)
@@ -1,7 +1,10 @@
 import torch
-from .misc import _scaled_dot_product, _convert_to_tensor, _is_finite, _select_initial_step, _handle_unused_kwargs
+from .misc import (
+    _convert_to_tensor, _is_finite, _select_initial_step, _handle_unused_kwargs,
+    _optimal_step_size, _compute_error_ratio, _rms_norm
+)
 from .solvers import AdaptiveStepsizeODESolver
-from .rk_common import _RungeKuttaState, _ButcherTableau, _runge_kutta_step
+from .rk_common import _RungeKuttaState, _ButcherTableau, _convert_tableau, _runge_kutta_step
 
 # Parameters from Tsitouras (2011).
 _TSITOURAS_TABLEAU = _ButcherTableau(
@@ -39,26 +42,14 @@ def _interp_coeff_tsit5(t0, dt, eval_t):
     return [b1, b2, b3, b4, b5, b6, b7]
 
 
-def _interp_eval_tsit5(t0, t1, k, eval_t):
+def _interp_eval_tsit5(t0, t1, interp_coeff, eval_t):
     dt = t1 - t0
-    y0 = tuple(k_[0] for k_ in k)
-    interp_coeff = _interp_coeff_tsit5(t0, dt, eval_t)
-    y_t = tuple(y0_ + _scaled_dot_product(dt, interp_coeff, k_) for y0_, k_ in zip(y0, k))
+    y0, k = interp_coeff
+    b = _convert_to_tensor(_interp_coeff_tsit5(t0, dt, eval_t), dtype=y0.dtype, device=y0.device)
+    y_t = y0 + torch.tensordot(b * dt.type_as(y0), k, dims=1)
     return y_t
 
 
-def _optimal_step_size(last_step, mean_error_ratio, safety=0.9, ifactor=10.0, dfactor=0.2, order=5):
-    """Calculate the optimal size for the next Runge-Kutta step."""
-    if mean_error_ratio == 0:
-        return last_step * ifactor
-    if mean_error_ratio < 1:
-        dfactor = _convert_to_tensor(1, dtype=torch.float64, device=mean_error_ratio.device)
-    error_ratio = torch.sqrt(mean_error_ratio).type_as(last_step)
-    exponent = torch.tensor(1 / order).type_as(last_step)
-    factor = torch.max(1 / ifactor, torch.min(error_ratio**exponent / safety, 1 / dfactor))
-    return last_step / factor
-
-
 def _abs_square(x):
     return torch.mul(x, x)
 
@@ -67,7 +58,7 @@ class Tsit5Solver(AdaptiveStepsizeODESolver):
 
     def __init__(
         self, func, y0, rtol, atol, first_step=None, safety=0.9, ifactor=10.0, dfactor=0.2, max_num_steps=2**31 - 1,
-        **unused_kwargs
+        norm=_rms_norm, **unused_kwargs
     ):
         _handle_unused_kwargs(self, unused_kwargs)
         del unused_kwargs
@@ -76,21 +67,23 @@ class Tsit5Solver(AdaptiveStepsizeODESolver):
         self.y0 = y0
         self.rtol = rtol
         self.atol = atol
+        self.norm = norm
         self.first_step = first_step
-        self.safety = _convert_to_tensor(safety, dtype=torch.float64, device=y0[0].device)
-        self.ifactor = _convert_to_tensor(ifactor, dtype=torch.float64, device=y0[0].device)
-        self.dfactor = _convert_to_tensor(dfactor, dtype=torch.float64, device=y0[0].device)
-        self.max_num_steps = _convert_to_tensor(max_num_steps, dtype=torch.int32, device=y0[0].device)
+        self.safety = _convert_to_tensor(safety, dtype=torch.float64, device=y0.device)
+        self.ifactor = _convert_to_tensor(ifactor, dtype=torch.float64, device=y0.device)
+        self.dfactor = _convert_to_tensor(dfactor, dtype=torch.float64, device=y0.device)
+        self.max_num_steps = _convert_to_tensor(max_num_steps, dtype=torch.int32, device=y0.device)
+        self.tableau = _convert_tableau(_TSITOURAS_TABLEAU, dtype=y0.dtype, device=y0.device)
 
     def before_integrate(self, t):
         if self.first_step is None:
-            first_step = _select_initial_step(self.func, t[0], self.y0, 4, self.rtol, self.atol).to(t)
+            first_step = _select_initial_step(self.func, t[0], self.y0, 4, self.rtol, self.atol, norm=self.norm).to(t)
         else:
             first_step = _convert_to_tensor(0.01, dtype=t.dtype, device=t.device)
         self.rk_state = _RungeKuttaState(
             self.y0,
-            self.func(t[0].type_as(self.y0[0]), self.y0), t[0], t[0], first_step,
-            tuple(map(lambda x: [x] * 7, self.y0))
+            self.func(t[0].type_as(self.y0), self.y0), t[0], t[0], first_step,
+            (self.y0, self.y0.expand(7, *self.y0.shape))
         )
 
     def advance(self, next_t):
@@ -109,23 +102,14 @@ class Tsit5Solver(AdaptiveStepsizeODESolver):
         #                      Assertions                      #
         ########################################################
         assert t0 + dt > t0, 'underflow in dt {}'.format(dt.item())
-        for y0_ in y0:
-            assert _is_finite(torch.abs(y0_)), 'non-finite values in state `y`: {}'.format(y0_)
-        y1, f1, y1_error, k = _runge_kutta_step(self.func, y0, f0, t0, dt, tableau=_TSITOURAS_TABLEAU)
+        assert _is_finite(torch.abs(y0)), 'non-finite values in state `y`: {}'.format(y0)
+        y1, f1, y1_error, k = _runge_kutta_step(self.func, y0, f0, t0, dt, tableau=self.tableau)
 
         ########################################################
         #                     Error Ratio                      #
         ########################################################
-        error_tol = tuple(self.atol + self.rtol * torch.max(torch.abs(y0_), torch.abs(y1_)) for y0_, y1_ in zip(y0, y1))
-        tensor_error_ratio = tuple(y1_error_ / error_tol_ for y1_error_, error_tol_ in zip(y1_error, error_tol))
-        sq_error_ratio = tuple(
-            torch.mul(tensor_error_ratio_, tensor_error_ratio_) for tensor_error_ratio_ in tensor_error_ratio
-        )
-        mean_error_ratio = (
-            sum(torch.sum(sq_error_ratio_) for sq_error_ratio_ in sq_error_ratio) /
-            sum(sq_error_ratio_.numel() for sq_error_ratio_ in sq_error_ratio)
-        )
-        accept_step = mean_error_ratio <= 1
+        error_ratio = _compute_error_ratio(y1_error, atol=self.atol, rtol=self.rtol, y0=y0, y1=y1, norm=self.norm)
+        accept_step = error_ratio <= 1
 
         ########################################################
         #                   Update RK State                    #
@@ -133,7 +117,7 @@ class Tsit5Solver(AdaptiveStepsizeODESolver):
         y_next = y1 if accept_step else y0
         f_next = f1 if accept_step else f0
         t_next = t0 + dt if accept_step else t0
-        dt_next = _optimal_step_size(dt, mean_error_ratio, self.safety, self.ifactor, self.dfactor)
-        k_next = k if accept_step else self.rk_state.interp_coeff
+        dt_next = _optimal_step_size(dt, error_ratio, self.safety, self.ifactor, self.dfactor, order=5)
+        k_next = (y0, k) if accept_step else rk_state.interp_coeff
         rk_state = _RungeKuttaState(y_next, f_next, t0, t_next, dt_next, k_next)
         return rk_state